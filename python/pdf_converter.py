@@ -11,11 +11,26 @@
 #   Ensure Poppler is installed and available in your PATH for pdf2image.
 # Dependency installation:
 #   All platforms (pip): `pip install pdf2image pillow`
-#   Linux (Debian/Ubuntu): `sudo apt-get install poppler-utils`
+#     For faster JPEG encoding and resizing, Pillow-SIMD (a drop-in fork
+#     with SSE4/AVX2 kernels) can be used instead of Pillow:
+#     `pip uninstall pillow && CC="cc -mavx2" pip install pillow-simd`
+#   Optional accelerators (pip):
+#     `pip install numpy PyTurboJPEG liburing python-poppler`
+#     (direct libjpeg-turbo encoding, batched io_uring writes on Linux, and in-process thumbnail
+#     rendering; each is skipped automatically when not installed)
+#   Linux (Debian/Ubuntu): `sudo apt-get install libjpeg-turbo8 poppler-utils`
 #   Windows: Install Poppler from
 #     `https://github.com/oschwartz10612/poppler-windows/releases` and add the
 #     `bin` folder to PATH.
-#   macOS (Homebrew): `brew install poppler`
+#   macOS (Homebrew): `brew install jpeg-turbo poppler`
+# libjpeg-turbo:
+#   JPEG encoding inside `pdftoppm` is much faster when Poppler is linked
+#   against libjpeg-turbo instead of the stock libjpeg. On Linux, a warning
+#   is printed at startup if stock libjpeg is detected (the check uses `ldd`
+#   and is skipped on other platforms). To build Poppler from source
+#   against libjpeg-turbo:
+#     `cmake -DWITH_JPEG=ON -DJPEG_INCLUDE_DIR=/opt/libjpeg-turbo/include \
+#            -DJPEG_LIBRARY=/opt/libjpeg-turbo/lib64/libjpeg.so ..`
 # -----------------------------------------------------------------------------
 # 日本語
 # 概要:
@@ -26,25 +41,145 @@
 #   pdf2image が動作するように Poppler をインストールし PATH に通してください。
 # 依存関係のインストール:
 #   全OS共通 (pip): `pip install pdf2image pillow`
-#   Linux (Debian/Ubuntu): `sudo apt-get install poppler-utils`
+#     JPEG エンコードやリサイズを高速化する場合は、Pillow の代わりに
+#     SSE4/AVX2 対応の互換フォーク Pillow-SIMD を利用できます:
+#     `pip uninstall pillow && CC="cc -mavx2" pip install pillow-simd`
+#   任意の高速化 (pip):
+#     `pip install numpy PyTurboJPEG liburing python-poppler`
+#     (libjpeg-turbo による直接エンコード、
+#     Linux での io_uring による一括書き込み、プロセス内でのサムネイル描画。
+#     インストールされていない場合は自動的に使用しません)
+#   Linux (Debian/Ubuntu): `sudo apt-get install libjpeg-turbo8 poppler-utils`
 #   Windows: `https://github.com/oschwartz10612/poppler-windows/releases` から
 #     Poppler を入手し `bin` フォルダを PATH に追加します。
-#   macOS (Homebrew): `brew install poppler`
+#   macOS (Homebrew): `brew install jpeg-turbo poppler`
+# libjpeg-turbo:
+#   `pdftoppm` 内部の JPEG エンコードは、Poppler が標準の libjpeg ではなく
+#   libjpeg-turbo とリンクされている場合に大幅に高速化されます。Linux では
+#   標準の libjpeg が検出された場合に起動時に警告を表示します (`ldd` を使った
+#   判定のため、他のOSでは判定しません)。libjpeg-turbo を使って Poppler を
+#   ソースからビルドする場合:
+#     `cmake -DWITH_JPEG=ON -DJPEG_INCLUDE_DIR=/opt/libjpeg-turbo/include \
+#            -DJPEG_LIBRARY=/opt/libjpeg-turbo/lib64/libjpeg.so ..`
 # -----------------------------------------------------------------------------
 
 import argparse
+import logging
+import logging.handlers
+import math
 import os
 import sys
 import shutil
-import glob
-from pdf2image import convert_from_path
+import io
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pdf2image import convert_from_path, pdfinfo_from_path
 from pdf2image.exceptions import (
     PDFInfoNotInstalledError,
     PDFPageCountError,
     PDFSyntaxError
 )
-# Pillow は pdf2image によって内部的に使われ、直接の import は save 時のオプション等でなければ不要な場合が多い
-# from PIL import Image
+import PIL
+from PIL import Image
+
+# 高DPIレンダリングではページ画像が Pillow の既定の画素数上限を超えることがある。
+# 読み込むのは Poppler が生成した画像のみなので、上限チェックを無効にする。
+Image.MAX_IMAGE_PIXELS = None
+
+# 出力は logging 経由で行う。情報は標準出力へ、警告・エラーは標準エラー出力へ出す。
+logger = logging.getLogger("pdf_converter")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if not logger.handlers:
+    _stdout_handler = logging.StreamHandler(sys.stdout)
+    _stdout_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+    _stderr_handler = logging.StreamHandler(sys.stderr)
+    _stderr_handler.setLevel(logging.WARNING)
+    for _handler in (_stdout_handler, _stderr_handler):
+        _handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_handler)
+
+# CPUコア数 (呼び出しごとに問い合わせないよう1度だけ取得する)
+_NCPU = os.cpu_count() or 1
+
+# pdftoppm が PATH 上にあるか (起動時に1度だけ確認する)
+_HAVE_PDFTOPPM = shutil.which("pdftoppm") is not None
+
+# JPEG保存オプション (Pillow の save 引数)。subsampling=2 は 4:2:0 で、文字主体のページでは画質差はほとんど無い。
+# ページは枚数が多いためエンコード速度を優先し、ハフマン最適化・プログレッシブは行わない。
+# サムネイルは1度書いて何度も読まれるため、エンコードに時間をかけてもサイズを小さくする。
+_JPEG_OPTS_PAGE = {'quality': 90, 'subsampling': 2, 'optimize': False, 'progressive': False}
+_JPEG_OPTS_THUMB = {'quality': 85, 'subsampling': 2, 'optimize': True, 'progressive': True}
+
+# Poppler (pdftoppm) 側でJPEGを書き出す場合のオプション。
+# pdftoppm ではサブサンプリングを指定できないが、libjpeg の既定値 (4:2:0) が使われる。
+_PDFTOPPM_JPEGOPT = {key: _JPEG_OPTS_PAGE[key] for key in ('quality', 'progressive', 'optimize')}
+_PDFTOPPM_JPEGOPT_ARG = ",".join(
+    f"{key}={('y' if value else 'n') if isinstance(value, bool) else value}"
+    for key, value in _PDFTOPPM_JPEGOPT.items()
+)
+
+# (幅指定あり, 高さ指定あり) -> (size引数, 表示用の説明) を返す関数
+_SIZE_HANDLERS = {
+    (True, True): lambda w, h: ((w, h), f"幅{w}px, 高さ{h}px"),
+    (True, False): lambda w, h: ((w, None), f"幅{w}px (アスペクト比維持)"),
+    (False, True): lambda w, h: ((None, h), f"高さ{h}px (アスペクト比維持)"),
+    (False, False): lambda w, h: (None, "デフォルト"),
+}
+
+# NumPy は任意の依存関係。PyTurboJPEG にページ画像を渡すために使う。
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# PyTurboJPEG も任意の依存関係。libjpeg-turbo のネイティブAPIで直接エンコードする。
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_444, TJSAMP_422, TJSAMP_420, TJFLAG_PROGRESSIVE
+    # Pillow の subsampling 値 (0: 4:4:4, 1: 4:2:2, 2: 4:2:0) との対応
+    _TURBO_SUBSAMPLING = {0: TJSAMP_444, 1: TJSAMP_422, 2: TJSAMP_420}
+except ImportError:
+    TurboJPEG = None
+
+def _create_turbo_jpeg():
+    """
+    TurboJPEG のインスタンスを生成します。
+    PyTurboJPEG / NumPy が無い場合や libturbojpeg が見つからない場合は None を返します。
+    """
+    if TurboJPEG is None or np is None:
+        return None
+    try:
+        return TurboJPEG()
+    except Exception:
+        return None
+
+# エンコーダはプロセスごとに1度だけ生成して使い回す
+_turbo_jpeg = _create_turbo_jpeg()
+
+# python-poppler も任意の依存関係。Poppler の C++ API をプロセス内で直接呼び出す。
+try:
+    import poppler
+except ImportError:
+    poppler = None
+
+# liburing (io_uring のPythonバインディング) も任意の依存関係。Linux でのみ使用する。
+liburing = None
+if sys.platform.startswith("linux"):
+    try:
+        import liburing
+    except ImportError:
+        liburing = None
+
+# pdfinfo に全ページのサイズを出力させるときの -l の値 (pdfinfo はページ数に切り詰める)
+_PDFINFO_LAST_PAGE = 2 ** 31 - 1
+
+# io_uring でまとめて書き込むページ数
+WRITE_BATCH_SIZE = 32
+
+# -W/-H の片方のみ指定時に1回でレンダリングする、ワーカーあたりのページ数。
+# 非圧縮 (PPM) の一時ファイルはこの単位でエンコード後に削除するため、一時領域の使用量はページ数に依らず一定になる。
+RESIZE_BATCH_PAGES_PER_WORKER = 8
 
 def get_output_basename(input_path, output_base_arg=None):
     """
@@ -57,117 +192,561 @@ def get_output_basename(input_path, output_base_arg=None):
     else:
         return os.path.splitext(os.path.basename(input_path))[0]
 
-def convert_pdf_pages_to_jpeg(input_pdf, output_dir, output_filename_base, width=None, height=None):
+def is_pillow_simd():
     """
-    PDFファイルの全ページをJPEGに変換して保存します。
+    Pillow-SIMD が使われているかどうかを返します。
+    Pillow-SIMD のバージョン番号には ".post" が付くため、それで判定します。
     """
-    print(f"--- PDF全ページ変換開始: {input_pdf} ---")
-    print(f"  出力ディレクトリ: {output_dir}")
-    print(f"  出力ファイル名ベース: {output_filename_base}")
-
-    size_arg = None
-    size_desc = "デフォルト"
-    if width is not None and height is not None:
-        size_arg = (width, height)
-        size_desc = f"幅{width}px, 高さ{height}px"
-    elif width is not None:
-        size_arg = (width, None)
-        size_desc = f"幅{width}px (アスペクト比維持)"
-    elif height is not None:
-        size_arg = (None, height)
-        size_desc = f"高さ{height}px (アスペクト比維持)"
-    print(f"  指定サイズ: {size_desc}")
+    return ".post" in PIL.__version__
+
+def check_poppler_jpeg_library():
+    """
+    pdftoppm がリンクしている JPEG ライブラリが libjpeg-turbo かどうかを調べます。
+    戻り値は True (libjpeg-turbo), False (標準の libjpeg), None (判定不能) のいずれかです。
+    ライブラリ名だけでは区別できない環境 (Ubuntu の libjpeg.so.8 等) があるため、
+    ライブラリ本体に埋め込まれた "libjpeg-turbo" の文字列で判定します。
+    依存ライブラリを間接的なものまで列挙できる ldd を使うため、判定は Linux のみで行います
+    (macOS の otool -L は直接の依存しか表示せず、pdftoppm は libpoppler 経由で libjpeg を使うため判定できません)。
+    """
+    pdftoppm_path = shutil.which("pdftoppm")
+    if pdftoppm_path is None or not sys.platform.startswith("linux"):
+        return None
 
     try:
-        os.makedirs(output_dir, exist_ok=True)
-        images = convert_from_path(
-            input_pdf,
-            dpi=300,
-            fmt='jpeg',
-            size=size_arg,
-            thread_count=os.cpu_count() or 1
+        result = subprocess.run(["ldd", pdftoppm_path], capture_output=True, text=True, timeout=10, check=False)
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    for line in result.stdout.splitlines():
+        if "jpeg" not in line.lower():
+            continue
+        if "turbo" in line.lower():
+            return True
+        # 例: "libjpeg.so.8 => /lib/x86_64-linux-gnu/libjpeg.so.8 (0x...)"
+        fields = line.split("=>")[-1].split()
+        if not fields:
+            continue
+        try:
+            with open(fields[0], "rb") as f:
+                return b"libjpeg-turbo" in f.read()
+        except OSError:
+            return None
+    return None
+
+def render_pages_with_poppler(document, dpi, first_page=1, last_page=None):
+    """
+    python-poppler で読み込んだ document のページをプロセス内でレンダリングし、RGBのPIL Imageを1ページずつ返すジェネレータです。
+    pdftoppm / pdfinfo のプロセス起動が不要なため、ページ数の少ないPDFで特に効果があります。
+    """
+    renderer = poppler.PageRenderer()
+    # 既定ではアンチエイリアスが無効なため、pdftoppm と同様に図形・文字とも有効にする
+    renderer.set_render_hint(poppler.RenderHint.antialiasing, True)
+    renderer.set_render_hint(poppler.RenderHint.text_antialiasing, True)
+    last_page = document.pages if last_page is None else min(last_page, document.pages)
+    for index in range(first_page - 1, last_page):
+        image = renderer.render_page(document.create_page(index), xres=dpi, yres=dpi)
+        yield Image.frombytes("RGBA", (image.width, image.height), image.data, "raw", str(image.format)).convert('RGB')
+
+def get_target_size(src_size, width=None, height=None):
+    """
+    縮小後の出力サイズ (幅, 高さ) を求めます。片方のみ指定された場合はアスペクト比を維持します。
+    """
+    src_w, src_h = src_size
+    return (
+        width if width is not None else max(1, round(src_w * height / src_h)),
+        height if height is not None else max(1, round(src_h * width / src_w))
+    )
+
+def get_page_sizes_pts(input_pdf, pdf_info=None, last_page=None):
+    """
+    PDFの各ページの表示上のサイズ (幅, 高さ) をポイント単位 (1/72インチ) のリストで返します。
+    pdf_info (pdfinfo_from_path の結果) にページごとのサイズ (-f/-l 付きで取得したもの) があればそれを使います。
+    無い場合は pdfinfo を -f/-l 付きで呼び出し、1ページ目から last_page (省略時は最終ページ) までのサイズを取得します。
+    ただし1ページ目のサイズだけで足りる場合 (last_page=1 または1ページのみのPDF) は、-f/-l 無しの pdf_info もそのまま使います。
+    90度・270度回転したページは幅と高さを入れ替えます。
+    行の例: "Page    2 size: 595.276 x 841.89 pts (A4)", "Page    2 rot: 90" (-f/-l 無しでは "Page size", "Page rot")
+    """
+    def per_page_size_keys(info):
+        return [key for key in info if key.startswith("Page ") and key.endswith(" size") and key != "Page size"]
+
+    size_keys = per_page_size_keys(pdf_info) if pdf_info is not None else []
+    # -f/-l 無しの pdf_info には1ページ目のサイズしか無く、他のページが大きい場合に解像度不足になるため取得し直す
+    if pdf_info is None or (not size_keys and last_page != 1 and pdf_info.get("Pages") != 1):
+        pdf_info = pdfinfo_from_path(input_pdf, first_page=1, last_page=last_page or _PDFINFO_LAST_PAGE)
+        size_keys = per_page_size_keys(pdf_info)
+    page_sizes = []
+    for key in size_keys or ["Page size"]:
+        label = key[:-len(" size")]
+        page_size = pdf_info[key].split()
+        page_w_pts, page_h_pts = float(page_size[0]), float(page_size[2])
+        if int(pdf_info.get(f"{label} rot", 0)) % 180 == 90:
+            page_w_pts, page_h_pts = page_h_pts, page_w_pts
+        page_sizes.append((page_w_pts, page_h_pts))
+    return page_sizes
+
+def pick_render_dpi(page_sizes, width=None, height=None, default_dpi=300, oversample=1.0, min_dpi=72):
+    """
+    指定された出力サイズを全てのページで満たす最小限のレンダリングDPIを求めます。
+    page_sizes は各ページのサイズ (幅, 高さ) (ポイント単位) のリストです。
+    幅・高さのどちらも指定されていない場合は default_dpi を返します。
+    oversample は縮小時の画質確保のための倍率です。
+    出力サイズが指定された場合は拡大にならないよう上限は設けず、下限の min_dpi のみ適用します。
+    """
+    if width is None and height is None:
+        return default_dpi
+    scale = max(
+        max(
+            width / page_w_pts if width is not None else 0,
+            height / page_h_pts if height is not None else 0
         )
+        for page_w_pts, page_h_pts in page_sizes
+    )
+    return max(min_dpi, math.ceil(72 * scale * oversample))
+
+def _to_rgb(img):
+    """
+    JPEG保存用にRGBへ変換します。
+    Image.convert は同じモードでも画像全体をコピーするため、既にRGBの場合はそのまま返します。
+    """
+    return img if img.mode == 'RGB' else img.convert('RGB')
 
-        if not images:
-            print(f"  エラー: {input_pdf} から画像への変換に失敗しました。", file=sys.stderr)
-            return False, 0
+def encode_jpeg(img, options=_JPEG_OPTS_PAGE):
+    """
+    PIL Image をJPEGにエンコードし、バイト列を返します。
+    options は Pillow の JPEG 保存オプション (_JPEG_OPTS_PAGE など) です。
+    TurboJPEG が使える場合は PIL の保存処理を通さずに直接エンコードします (optimize は無視されます)。
+    """
+    if _turbo_jpeg is not None:
+        return _turbo_jpeg.encode(
+            np.asarray(_to_rgb(img)),
+            quality=options['quality'],
+            pixel_format=TJPF_RGB,
+            jpeg_subsample=_TURBO_SUBSAMPLING[options['subsampling']],
+            flags=TJFLAG_PROGRESSIVE if options['progressive'] else 0
+        )
+    buf = io.BytesIO()
+    _to_rgb(img).save(buf, 'JPEG', **options)
+    return buf.getvalue()
 
-        num_pages = len(images)
-        print(f"  {num_pages} ページを検出。JPEGファイルに変換・保存します...")
+def _write_files_io_uring(pending):
+    """
+    io_uring で複数ファイルへの書き込みをまとめて発行し、全ての完了を待ちます。
+    """
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    fds = []
+    liburing.io_uring_queue_init(len(pending), ring)
+    try:
+        for data, output_path in pending:
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            fds.append(fd)
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, fd, data, 0)
+        liburing.io_uring_submit_and_wait(ring, len(pending))
+        completed = 0
+        while completed < len(pending):
+            liburing.io_uring_wait_cqe(ring, cqe)
+            ready = liburing.io_uring_cq_ready(ring)
+            for i in range(ready):
+                liburing.trap_error(cqe[i].res) # 書き込み失敗時は OSError を送出
+            liburing.io_uring_cq_advance(ring, ready)
+            completed += ready
+        # 短い書き込みが無かったことをファイルサイズで確認する
+        for fd, (data, output_path) in zip(fds, pending):
+            if os.fstat(fd).st_size != len(data):
+                raise OSError(f"書き込みが途中で終了しました: {output_path}")
+    finally:
+        for fd in fds:
+            os.close(fd)
+        liburing.io_uring_queue_exit(ring)
+
+def write_files(pending):
+    """
+    (データ, 出力パス) のリストをまとめてファイルに書き込みます。
+    Linux で liburing が使える場合は io_uring で一括発行し、それ以外は通常の書き込みを行います。
+    """
+    if not pending:
+        return
+    if liburing is not None:
+        try:
+            _write_files_io_uring(pending)
+            return
+        except (AttributeError, TypeError, OSError) as e:
+            # バインディングの版差異 (AttributeError/TypeError) や、io_uring が使えない環境・書き込み失敗 (OSError) の
+            # 場合は通常の書き込みでやり直す (O_TRUNC で開き直すため、途中まで書かれたファイルも上書きされる)
+            logger.debug(f"  io_uring での書き込みに失敗したため通常の書き込みで再試行します ({type(e).__name__}): {e}")
+    for data, output_path in pending:
+        with open(output_path, 'wb') as f:
+            f.write(data)
+
+def encode_resized_page(page_path, width=None, height=None):
+    """
+    レンダリング済みのページ画像を指定サイズに縮小し、JPEGのバイト列を返します。
+    幅・高さの片方のみ指定された場合はアスペクト比を維持します。縮小には BICUBIC を使います。
+    """
+    with Image.open(page_path) as img:
+        target_size = get_target_size(img.size, width, height)
+        if img.size == target_size:
+            return encode_jpeg(img)
+        return encode_jpeg(img.resize(target_size, Image.BICUBIC))
 
-        for i, img in enumerate(images):
-            page_num = i + 1
-            output_jpeg_filename = f"{output_filename_base}_page{page_num}.jpg"
-            output_jpeg_path = os.path.join(output_dir, output_jpeg_filename)
-            print(f"    ページ {page_num}/{num_pages} -> {output_jpeg_path}")
-            img.save(output_jpeg_path, 'JPEG', quality=90)
+def _run_pdftoppm(input_pdf, output_folder, dpi, fmt, size=None, first_page=None, last_page=None):
+    """
+    pdftoppm を1回起動し、指定範囲のページを output_folder に "page-<ページ番号>" の名前で書き出します。
+    正常終了した場合は True を返します。
+    """
+    command = ["pdftoppm", "-r", str(dpi)]
+    if fmt == 'jpeg':
+        command += ["-jpeg", "-jpegopt", _PDFTOPPM_JPEGOPT_ARG]
+    if first_page is not None:
+        command += ["-f", str(first_page), "-l", str(last_page)]
+    if size is not None:
+        command += ["-scale-to-x", str(size[0]), "-scale-to-y", str(size[1])]
+    command += [input_pdf, os.path.join(output_folder, "page")]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        logger.error(f"  pdftoppm がエラー終了しました (終了コード {result.returncode}): {result.stderr.strip()}")
+        return False
+    return True
 
-        print(f"--- PDF全ページ変換完了: {input_pdf} ({num_pages}ページ) ---")
+def render_pages_with_pdftoppm(input_pdf, output_folder, dpi=300, fmt='jpeg', size=None, workers=1, pdf_info=None,
+                               first_page=None, last_page=None):
+    """
+    pdftoppm を直接呼び出してページを output_folder に書き出し、ページ順のパスのリストを返します。
+    first_page / last_page を省略した場合は全ページを対象とします。
+    workers が2以上の場合はページ範囲ごとに分割し、複数の pdftoppm を並列に起動します
+    (レンダリングは子プロセスで行われるため、呼び出し側はスレッドで十分です)。
+    pdftoppm は "<接頭辞>-<ページ番号>.<拡張子>" (ページ番号はゼロ埋め) の名前で出力します。
+    pdf_info (pdfinfo_from_path の結果) が渡された場合はページ数の取得に再利用します。
+    """
+    page_ranges = [(first_page, last_page)]
+    if workers > 1:
+        if first_page is None:
+            if pdf_info is None:
+                pdf_info = pdfinfo_from_path(input_pdf)
+            first_page, last_page = 1, pdf_info["Pages"]
+        num_pages = last_page - first_page + 1
+        # 1チャンクが小さすぎるとプロセス起動のコストが目立つため、最低8ページとする
+        chunk = max(8, num_pages // (2 * _NCPU))
+        page_ranges = [(first, min(first + chunk - 1, last_page)) for first in range(first_page, last_page + 1, chunk)]
+
+    if len(page_ranges) == 1:
+        results = [_run_pdftoppm(input_pdf, output_folder, dpi, fmt, size, *page_ranges[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(page_ranges))) as executor:
+            results = list(executor.map(
+                lambda page_range: _run_pdftoppm(input_pdf, output_folder, dpi, fmt, size, *page_range),
+                page_ranges
+            ))
+    if not all(results):
+        return []
+
+    ext = '.jpg' if fmt == 'jpeg' else '.ppm'
+    page_files = [name for name in os.listdir(output_folder) if name.startswith("page-") and name.endswith(ext)]
+    page_files.sort(key=lambda name: int(name[len("page-"):-len(ext)]))
+    return [os.path.join(output_folder, name) for name in page_files]
+
+def log_page_progress(page_num, num_pages, output_jpeg_path):
+    """
+    ページの保存状況を出力します。
+    ページごとの行は DEBUG レベルとし、INFO レベルでは10%ごと (と最終ページ) にのみ進捗を出力します。
+    """
+    logger.debug(f"    ページ {page_num}/{num_pages} -> {output_jpeg_path}")
+    step = max(1, num_pages // 10)
+    if page_num % step == 0 or page_num == num_pages:
+        logger.info(f"    ページ {page_num}/{num_pages} ({page_num * 100 // num_pages}%) -> {output_jpeg_path}")
+
+def convert_pdf_pages_to_jpeg(input_pdf, output_dir, output_filename_base, width=None, height=None, thread_count=None, pdf_info=None):
+    """
+    PDFファイルの全ページをJPEGに変換して保存します。
+    thread_countを省略した場合はCPUコア数分のスレッドでレンダリングします。
+    pdf_info (pdfinfo_from_path の結果) を渡すと、DPI決定やページ分割に再利用します。
+    -W/-H の片方のみの指定で pdf_info にページごとのサイズが無い場合は、-f/-l 付きで取得し直します。
+    """
+    logger.info(f"--- PDF全ページ変換開始: {input_pdf} ---")
+    logger.info(f"  出力ディレクトリ: {output_dir}")
+    logger.info(f"  出力ファイル名ベース: {output_filename_base}")
+
+    size_arg, size_desc = _SIZE_HANDLERS[(width is not None, height is not None)](width, height)
+    logger.info(f"  指定サイズ: {size_desc}")
+
+    # 幅・高さが両方指定された場合は、Popplerに目的のサイズで直接JPEGを出力させる (縮小は不要)。
+    # 片方のみの場合は要求サイズを満たす最小限のDPIで非圧縮 (PPM) でレンダリングし、
+    # こちらでBICUBICで縮小してからJPEGにエンコードする。
+    render_size = size_arg if width is not None and height is not None else None
+    needs_resize = size_arg is not None and render_size is None
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        workers = thread_count or _NCPU
+        # DPI決定 (ページサイズ) とページ分割 (ページ数) の両方で使うため、pdfinfo は1回だけ呼び出す。
+        # どちらも不要な場合 (縮小なし・単一スレッド) は pdfinfo を起動しない。
+        # 縮小する場合は大きさの異なるページも考慮するため、全ページのサイズを出力させる。
+        if pdf_info is None and needs_resize:
+            pdf_info = pdfinfo_from_path(input_pdf, first_page=1, last_page=_PDFINFO_LAST_PAGE)
+        elif pdf_info is None and workers > 1 and _HAVE_PDFTOPPM:
+            pdf_info = pdfinfo_from_path(input_pdf)
+        # 出力サイズを指定してレンダリングする場合、DPIは使われない
+        dpi = pick_render_dpi(get_page_sizes_pts(input_pdf, pdf_info), width, height) if needs_resize else 300
+        render_fmt = 'ppm' if needs_resize else 'jpeg'
+
+        # 縮小する場合は非圧縮 (PPM) の一時ファイルが大きいため、一定ページ数ずつレンダリングし、
+        # エンコード・書き込み後に削除してから次のページ範囲をレンダリングする。
+        # それ以外は全ページを一度にレンダリングする (ページ数は出力されたファイル数から求める)。
+        if needs_resize:
+            num_pages = pdf_info["Pages"]
+            batch_pages = RESIZE_BATCH_PAGES_PER_WORKER * workers
+            page_batches = [
+                (first, min(first + batch_pages - 1, num_pages))
+                for first in range(1, num_pages + 1, batch_pages)
+            ]
+            logger.info(f"  {num_pages} ページを検出。JPEGファイルに変換・保存します...")
+        else:
+            num_pages = None
+            page_batches = [(None, None)]
+
+        for first_page, last_page in page_batches:
+            # Popplerに一時ディレクトリへ直接画像を書き出させ、パスのみを受け取る。
+            # 全ページをPIL Imageとしてメモリに展開しないため、ページ数に依らずメモリ使用量が一定になる。
+            # os.replace で移動できるよう、一時ディレクトリは出力先と同じファイルシステム上に作成する。
+            with tempfile.TemporaryDirectory(dir=output_dir) as tmpdir:
+                if _HAVE_PDFTOPPM:
+                    # pdftoppm を直接呼び出し、複数スレッドを使える場合はページ範囲ごとに並列レンダリングする
+                    page_paths = render_pages_with_pdftoppm(
+                        input_pdf, tmpdir, dpi, render_fmt, render_size, workers=workers, pdf_info=pdf_info,
+                        first_page=first_page, last_page=last_page
+                    )
+                else:
+                    page_paths = convert_from_path(
+                        input_pdf,
+                        dpi=dpi,
+                        fmt=render_fmt,
+                        jpegopt=_PDFTOPPM_JPEGOPT,
+                        size=render_size,
+                        first_page=first_page,
+                        last_page=last_page,
+                        output_folder=tmpdir,
+                        paths_only=True,
+                        thread_count=workers
+                    )
+
+                if not page_paths:
+                    logger.error(f"  エラー: {input_pdf} から画像への変換に失敗しました。")
+                    return False, 0
+
+                if num_pages is None:
+                    num_pages = len(page_paths)
+                    logger.info(f"  {num_pages} ページを検出。JPEGファイルに変換・保存します...")
+
+                first_page_num = first_page or 1
+                output_jpeg_paths = [
+                    os.path.join(output_dir, f"{output_filename_base}_page{page_num}.jpg")
+                    for page_num in range(first_page_num, first_page_num + len(page_paths))
+                ]
+                if needs_resize:
+                    # デコード・縮小・エンコードはスレッドプールで並列に行い (いずれもGILを解放する)、
+                    # 結果をページ順に受け取って WRITE_BATCH_SIZE ページごとにまとめて書き込む
+                    pending_writes = []
+                    with ThreadPoolExecutor(max_workers=min(8, workers)) as executor:
+                        encoded_pages = executor.map(
+                            lambda page_path: encode_resized_page(page_path, width, height),
+                            page_paths
+                        )
+                        for page_num, (data, output_jpeg_path) in enumerate(zip(encoded_pages, output_jpeg_paths), start=first_page_num):
+                            log_page_progress(page_num, num_pages, output_jpeg_path)
+                            pending_writes.append((data, output_jpeg_path))
+                            if len(pending_writes) >= WRITE_BATCH_SIZE:
+                                write_files(pending_writes)
+                                pending_writes = []
+                    write_files(pending_writes)
+                else:
+                    for page_num, (page_path, output_jpeg_path) in enumerate(zip(page_paths, output_jpeg_paths), start=first_page_num):
+                        log_page_progress(page_num, num_pages, output_jpeg_path)
+                        os.replace(page_path, output_jpeg_path)
+
+        logger.info(f"--- PDF全ページ変換完了: {input_pdf} ({num_pages}ページ) ---")
         return True, num_pages
 
     except (PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError, FileNotFoundError) as e:
-        print(f"  エラー ({type(e).__name__}): {input_pdf} の処理中にエラーが発生しました: {e}", file=sys.stderr)
+        logger.error(f"  エラー ({type(e).__name__}): {input_pdf} の処理中にエラーが発生しました: {e}")
         if isinstance(e, PDFInfoNotInstalledError):
-            print("  poppler-utilsが正しくインストールされ、PATHが通っているか確認してください。", file=sys.stderr)
+            logger.error("  poppler-utilsが正しくインストールされ、PATHが通っているか確認してください。")
         return False, 0
     except Exception as e:
-        print(f"  予期せぬエラー ({type(e).__name__}): {input_pdf} の処理中に発生: {e}", file=sys.stderr)
+        logger.error(f"  予期せぬエラー ({type(e).__name__}): {input_pdf} の処理中に発生: {e}")
         return False, 0
 
-def generate_pdf_thumbnail(input_pdf, output_dir, output_filename_base, thumb_width=None, thumb_height=None, thumb_suffix="_thumbnail"):
+def generate_pdf_thumbnail(input_pdf, output_dir, output_filename_base, thumb_width=None, thumb_height=None, thumb_suffix="_thumbnail", pdf_info=None):
     """
     PDFファイルの1ページ目からサムネイル画像を生成して保存します。
+    pdf_info (pdfinfo_from_path の結果) を渡すと、DPI決定に再利用します。
     """
-    print(f"--- サムネイル生成開始: {input_pdf} ---")
-    print(f"  出力ディレクトリ: {output_dir}")
-    print(f"  出力ファイル名ベース: {output_filename_base}{thumb_suffix}.jpg")
-
-    size_arg = None
-    size_desc = "デフォルト (1ページ目)"
-    if thumb_width is not None and thumb_height is not None:
-        size_arg = (thumb_width, thumb_height)
-        size_desc = f"幅{thumb_width}px, 高さ{thumb_height}px"
-    elif thumb_width is not None:
-        size_arg = (thumb_width, None)
-        size_desc = f"幅{thumb_width}px (アスペクト比維持)"
-    elif thumb_height is not None:
-        size_arg = (None, thumb_height)
-        size_desc = f"高さ{thumb_height}px (アスペクト比維持)"
-    print(f"  指定サムネイルサイズ: {size_desc}")
+    logger.info(f"--- サムネイル生成開始: {input_pdf} ---")
+    logger.info(f"  出力ディレクトリ: {output_dir}")
+    logger.info(f"  出力ファイル名ベース: {output_filename_base}{thumb_suffix}.jpg")
+
+    size_arg, size_desc = _SIZE_HANDLERS[(thumb_width is not None, thumb_height is not None)](thumb_width, thumb_height)
+    if size_arg is None:
+        size_desc = "デフォルト (1ページ目)"
+    logger.info(f"  指定サムネイルサイズ: {size_desc}")
 
     try:
         os.makedirs(output_dir, exist_ok=True)
-        images = convert_from_path(
-            input_pdf,
-            dpi=200, # サムネイルなので少し解像度を落としても良い場合がある
-            fmt='jpeg',
-            size=size_arg,
-            first_page=1,
-            last_page=1, # 1ページ目のみを対象
-            thread_count=1 # 1ページだけなので複数スレッドは不要
-        )
-
-        if not images:
-            print(f"  エラー: {input_pdf} からサムネイル画像への変換に失敗しました。", file=sys.stderr)
-            return False
-
+        # サムネイルなので少し解像度を落としても良い場合がある
+        dpi_options = {'default_dpi': 200, 'oversample': 1.5, 'min_dpi': 36}
         output_thumb_filename = f"{output_filename_base}{thumb_suffix}.jpg"
         output_thumb_path = os.path.join(output_dir, output_thumb_filename)
-        print(f"    1ページ目をサムネイルとして保存 -> {output_thumb_path}")
-        images[0].save(output_thumb_path, 'JPEG', quality=85) # サムネイル品質
 
-        print(f"--- サムネイル生成完了: {input_pdf} ---")
+        if poppler is not None:
+            # python-poppler があればプロセス内でレンダリングし、pdftoppm の起動を省く。
+            # ドキュメントは1度だけ読み込み、ページサイズの取得とレンダリングの両方に使う。
+            document = poppler.load_from_file(input_pdf)
+            page = document.create_page(0)
+            page_rect = page.page_rect()
+            page_size = (page_rect.width, page_rect.height)
+            # page_rect() は /Rotate を反映しないが render_page は回転後の向きで描画するため、
+            # get_page_sizes_pts と同様に90度・270度回転のページは幅と高さを入れ替える
+            if page.orientation.name in ("landscape", "seascape"):
+                page_size = (page_rect.height, page_rect.width)
+            dpi = pick_render_dpi([page_size], thumb_width, thumb_height, **dpi_options)
+            img = next(render_pages_with_poppler(document, dpi, first_page=1, last_page=1), None)
+            if img is None:
+                logger.error(f"  エラー: {input_pdf} からサムネイル画像への変換に失敗しました。")
+                return False
+            logger.info(f"    1ページ目をサムネイルとして保存 -> {output_thumb_path}")
+            if size_arg is not None:
+                img = img.resize(get_target_size(img.size, thumb_width, thumb_height), Image.BICUBIC)
+            _to_rgb(img).save(output_thumb_path, 'JPEG', **_JPEG_OPTS_THUMB)
+        else:
+            # 要求サイズから必要最小限のDPIを求めてレンダリングし、
+            # JPEGのDCTスケーリング (Image.draft) で縮小しながらデコードする
+            page_sizes = get_page_sizes_pts(input_pdf, pdf_info, last_page=1)[:1] if size_arg is not None else []
+            dpi = pick_render_dpi(page_sizes, thumb_width, thumb_height, **dpi_options)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                if _HAVE_PDFTOPPM:
+                    # pdftoppm を直接呼び出し、pdf2image がページ数取得のために起動する pdfinfo を省く
+                    ok = _run_pdftoppm(input_pdf, tmpdir, dpi, 'jpeg', first_page=1, last_page=1)
+                    page_paths = [os.path.join(tmpdir, name) for name in os.listdir(tmpdir)] if ok else []
+                else:
+                    page_paths = convert_from_path(
+                        input_pdf,
+                        dpi=dpi,
+                        fmt='jpeg',
+                        first_page=1,
+                        last_page=1, # 1ページ目のみを対象
+                        output_folder=tmpdir,
+                        paths_only=True,
+                        thread_count=1 # 1ページだけなので複数スレッドは不要
+                    )
+
+                if not page_paths:
+                    logger.error(f"  エラー: {input_pdf} からサムネイル画像への変換に失敗しました。")
+                    return False
+
+                logger.info(f"    1ページ目をサムネイルとして保存 -> {output_thumb_path}")
+                with Image.open(page_paths[0]) as img:
+                    if size_arg is not None:
+                        target_size = get_target_size(img.size, thumb_width, thumb_height)
+                        img.draft('RGB', target_size)
+                        img = img.resize(target_size, Image.BICUBIC)
+                    _to_rgb(img).save(output_thumb_path, 'JPEG', **_JPEG_OPTS_THUMB)
+
+        logger.info(f"--- サムネイル生成完了: {input_pdf} ---")
         return True
 
     except (PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError, FileNotFoundError) as e:
-        print(f"  エラー ({type(e).__name__}): {input_pdf} のサムネイル生成中にエラー: {e}", file=sys.stderr)
+        logger.error(f"  エラー ({type(e).__name__}): {input_pdf} のサムネイル生成中にエラー: {e}")
         if isinstance(e, PDFInfoNotInstalledError):
-            print("  poppler-utilsが正しくインストールされ、PATHが通っているか確認してください。", file=sys.stderr)
+            logger.error("  poppler-utilsが正しくインストールされ、PATHが通っているか確認してください。")
         return False
     except Exception as e:
-        print(f"  予期せぬエラー ({type(e).__name__}): {input_pdf} のサムネイル生成中に発生: {e}", file=sys.stderr)
+        logger.error(f"  予期せぬエラー ({type(e).__name__}): {input_pdf} のサムネイル生成中に発生: {e}")
         return False
 
+def copy_pdf_file(src_path, dst_path):
+    """
+    PDFファイルをコピーします (メタデータはコピーしません)。
+    os.copy_file_range が使える場合はカーネル内でコピーし (reflink対応FSでは即時完了)、
+    使えない場合は shutil.copyfile (Linux では sendfile によるゼロコピー) にフォールバックします。
+    """
+    # 同じファイルに対して 'wb' で開くとコピー前に入力が切り詰められるため、shutil.copyfile と同様に拒否する
+    if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+        raise shutil.SameFileError(f"{src_path!r} と {dst_path!r} は同じファイルです")
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass # 非対応のファイルシステム等。shutil.copyfile でやり直す
+    shutil.copyfile(src_path, dst_path)
+
+def _process_one(pdf_path, args_dict, actual_output_dir, thread_count=None):
+    """
+    1つのPDFファイルを処理します。
+    args_dictはコマンドライン引数を辞書化したものです。
+    戻り値は (成功したかどうか, 変換ページ数) のタプルです。
+    """
+    logger.info(f"\n>>> 処理中のファイル: {pdf_path}")
+
+    # 出力ファイル名のベースを決定
+    # 単一ファイル処理で --output-base が指定され、かつサムネイルのみでない場合に限り、それを使用
+    current_output_base_name_arg = None
+    if args_dict["input_file"] and args_dict["output_base"]: # -i と -o が両方指定された場合
+         current_output_base_name_arg = args_dict["output_base"]
+
+    base_name = get_output_basename(pdf_path, current_output_base_name_arg)
+
+    num_pages = 0
+
+    if args_dict["thumbnail_only"]:
+        # サムネイルのみ生成
+        ok = generate_pdf_thumbnail(pdf_path, actual_output_dir, base_name,
+                                    args_dict["thumb_width"], args_dict["thumb_height"], args_dict["thumb_suffix"])
+    else:
+        # 全ページ変換を実行
+        ok, num_pages = convert_pdf_pages_to_jpeg(
+            pdf_path, actual_output_dir, base_name, args_dict["width"], args_dict["height"], thread_count
+        )
+
+        # 単一ファイル処理で -o (output_base) が指定され、かつ全ページ変換が成功した場合のみPDFをコピー
+        if args_dict["input_file"] and current_output_base_name_arg and ok:
+            output_pdf_filename = f"{base_name}.pdf" # get_output_basenameで拡張子は除去されているので .pdf を付与
+            output_pdf_path = os.path.join(actual_output_dir, output_pdf_filename)
+            try:
+                logger.info(f"  入力PDFをコピーしています: {pdf_path} -> {output_pdf_path}")
+                copy_pdf_file(pdf_path, output_pdf_path)
+                logger.info(f"  PDFのコピー完了: {output_pdf_path}")
+            except Exception as e:
+                logger.error(f"  エラー: PDFファイル '{pdf_path}' のコピー中にエラー: {e}")
+                # PDFコピー失敗は致命的ではないとし、エラーカウントは増やさないことも考えられる
+
+    return ok, num_pages
+
+def _process_one_buffered(pdf_path, args_dict, actual_output_dir, thread_count=None):
+    """
+    ProcessPoolExecutorのワーカーから呼び出され、_process_one を実行します。
+    複数ファイルのログが行単位で混ざらないよう、ログレコードは出力せずに溜めておき、
+    (成功したかどうか, 変換ページ数, ログレコードのリスト) として親プロセスに返します。
+    """
+    buffer_handler = logging.handlers.BufferingHandler(math.inf)
+    saved_handlers = logger.handlers
+    logger.handlers = [buffer_handler]
+    try:
+        ok, num_pages = _process_one(pdf_path, args_dict, actual_output_dir, thread_count)
+    except Exception as e:
+        logger.error(f"  予期せぬエラー ({type(e).__name__}): {pdf_path} の処理中に発生: {e}")
+        ok, num_pages = False, 0
+    finally:
+        logger.handlers = saved_handlers
+    return ok, num_pages, buffer_handler.buffer
+
 def main():
     parser = argparse.ArgumentParser(
         description="PDFファイルをページごと、またはサムネイルとしてJPEGに変換するコマンドラインツール",
@@ -241,6 +820,10 @@ def main():
 
     args = parser.parse_args()
 
+    logger.info(f"Pillow {PIL.__version__} (SIMD: {'有効' if is_pillow_simd() else '無効'})")
+    if check_poppler_jpeg_library() is False:
+        logger.warning("警告: pdftoppm が標準の libjpeg とリンクされています。libjpeg-turbo 版の Poppler を使うと JPEG 変換が高速になります。")
+
     # ---- 出力ディレクトリの決定 ----
     actual_output_dir = args.output_dir
     if args.input_folder: # フォルダ処理
@@ -253,7 +836,7 @@ def main():
     try:
         os.makedirs(actual_output_dir, exist_ok=True)
     except OSError as e:
-        print(f"エラー: 出力ディレクトリ '{actual_output_dir}' の作成に失敗しました: {e}", file=sys.stderr)
+        logger.error(f"エラー: 出力ディレクトリ '{actual_output_dir}' の作成に失敗しました: {e}")
         sys.exit(1)
 
 
@@ -261,85 +844,75 @@ def main():
     pdf_files_to_process = []
     if args.input_file:
         if not os.path.isfile(args.input_file):
-            print(f"エラー: 入力ファイルが見つかりません: {args.input_file}", file=sys.stderr)
+            logger.error(f"エラー: 入力ファイルが見つかりません: {args.input_file}")
             sys.exit(1)
         if not args.input_file.lower().endswith(".pdf"):
-            print(f"エラー: 入力ファイルはPDFファイルではありません: {args.input_file}", file=sys.stderr)
+            logger.error(f"エラー: 入力ファイルはPDFファイルではありません: {args.input_file}")
             sys.exit(1)
         pdf_files_to_process.append(args.input_file)
 
     elif args.input_folder:
         if not os.path.isdir(args.input_folder):
-            print(f"エラー: 入力フォルダが見つかりません: {args.input_folder}", file=sys.stderr)
+            logger.error(f"エラー: 入力フォルダが見つかりません: {args.input_folder}")
             sys.exit(1)
-        # glob を使ってサブディレクトリを含まないPDFファイルを検索
-        for filepath in glob.glob(os.path.join(args.input_folder, '*.pdf')):
-            if os.path.isfile(filepath): # 念のためファイルであるか確認
-                 pdf_files_to_process.append(filepath)
-        for filepath in glob.glob(os.path.join(args.input_folder, '*.PDF')): # 大文字拡張子も
-            if os.path.isfile(filepath) and filepath not in pdf_files_to_process:
-                 pdf_files_to_process.append(filepath)
-
+        # os.scandir で1回だけディレクトリを走査し、サブディレクトリを含まないPDFファイルを検索
+        # (拡張子は大文字・小文字を区別しない。glob と同様に隠しファイルは対象外)
+        with os.scandir(args.input_folder) as entries:
+            pdf_files_to_process = [
+                entry.path for entry in entries
+                if not entry.name.startswith('.')
+                and entry.name.lower().endswith('.pdf')
+                and entry.is_file()
+            ]
 
         if not pdf_files_to_process:
-            print(f"情報: 入力フォルダ '{args.input_folder}' 内にPDFファイルが見つかりませんでした。", file=sys.stdout)
+            logger.info(f"情報: 入力フォルダ '{args.input_folder}' 内にPDFファイルが見つかりませんでした。")
             sys.exit(0)
-        print(f"{len(pdf_files_to_process)} 件のPDFファイルを '{args.input_folder}' から検出しました。")
+        logger.info(f"{len(pdf_files_to_process)} 件のPDFファイルを '{args.input_folder}' から検出しました。")
 
     # ---- 各PDFファイルの処理 ----
-    total_files_processed = 0
-    total_errors = 0
-
-    for pdf_path in pdf_files_to_process:
-        print(f"\n>>> 処理中のファイル: {pdf_path}")
-
-        # 出力ファイル名のベースを決定
-        # 単一ファイル処理で --output-base が指定され、かつサムネイルのみでない場合に限り、それを使用
-        current_output_base_name_arg = None
-        if args.input_file and args.output_base: # -i と -o が両方指定された場合
-             current_output_base_name_arg = args.output_base
-        
-        base_name = get_output_basename(pdf_path, current_output_base_name_arg)
-
-        success_flag = True
-
-        if args.thumbnail_only:
-            # サムネイルのみ生成
-            if not generate_pdf_thumbnail(pdf_path, actual_output_dir, base_name,
-                                      args.thumb_width, args.thumb_height, args.thumb_suffix):
-                success_flag = False
-                total_errors +=1
+    # 複数ファイルはファイル単位で並列処理する。Popplerはファイルごとに別プロセスで動くため安全。
+    # 各ワーカー内のレンダリングスレッド数はコア数をワーカー数で割った値に抑え、過剰な並列化を避ける。
+    # ワーカーのログはファイルごとにまとめて受け取り、完了順に親プロセスから出力する。
+    successes = 0
+    errors = 0
+    args_dict = vars(args)
+
+    if len(pdf_files_to_process) == 1:
+        # 1ファイルだけならワーカープロセスを起動せず、このプロセスで全コアを使って処理する
+        ok, _num_pages = _process_one(pdf_files_to_process[0], args_dict, actual_output_dir, _NCPU)
+        if ok:
+            successes += 1
         else:
-            # 全ページ変換を実行
-            pages_converted_success, num_pages = convert_pdf_pages_to_jpeg(
-                pdf_path, actual_output_dir, base_name, args.width, args.height
-            )
-            if not pages_converted_success:
-                success_flag = False
-                total_errors +=1
-
-            # 単一ファイル処理で -o (output_base) が指定され、かつ全ページ変換が成功した場合のみPDFをコピー
-            if args.input_file and current_output_base_name_arg and pages_converted_success:
-                output_pdf_filename = f"{base_name}.pdf" # get_output_basenameで拡張子は除去されているので .pdf を付与
-                output_pdf_path = os.path.join(actual_output_dir, output_pdf_filename)
+            errors += 1
+    else:
+        max_workers = min(len(pdf_files_to_process), _NCPU)
+        worker_thread_count = max(1, _NCPU // max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_process_one_buffered, pdf_path, args_dict, actual_output_dir, worker_thread_count): pdf_path
+                for pdf_path in pdf_files_to_process
+            }
+            for future in as_completed(futures):
                 try:
-                    print(f"  入力PDFをコピーしています: {pdf_path} -> {output_pdf_path}")
-                    shutil.copy2(pdf_path, output_pdf_path)
-                    print(f"  PDFのコピー完了: {output_pdf_path}")
+                    ok, _num_pages, log_records = future.result()
                 except Exception as e:
-                    print(f"  エラー: PDFファイル '{pdf_path}' のコピー中にエラー: {e}", file=sys.stderr)
-                    # PDFコピー失敗は致命的ではないとし、エラーカウントは増やさないことも考えられる
-        
-        if success_flag:
-            total_files_processed +=1
-
-    print("\n--- 全ての処理が完了しました ---")
+                    logger.error(f"  予期せぬエラー ({type(e).__name__}): {futures[future]} の処理中に発生: {e}")
+                    ok, log_records = False, []
+                for record in log_records:
+                    logger.handle(record)
+                if ok:
+                    successes += 1
+                else:
+                    errors += 1
+
+    logger.info("\n--- 全ての処理が完了しました ---")
     if pdf_files_to_process: # 何かしら処理対象があった場合
-        print(f"処理対象ファイル数: {len(pdf_files_to_process)}")
-        print(f"正常処理ファイル数: {total_files_processed - total_errors}") # 成功フラグベースだと数え方が変わる
-        print(f"エラー発生ファイル数: {total_errors}")
+        logger.info(f"処理対象ファイル数: {len(pdf_files_to_process)}")
+        logger.info(f"正常処理ファイル数: {successes}")
+        logger.info(f"エラー発生ファイル数: {errors}")
     
-    if total_errors > 0:
+    if errors > 0:
         sys.exit(1)
     sys.exit(0)
 